@@ -36,36 +36,39 @@ def test_column_insertion_alignment():
 
     print("=== COMPARING WITH BROKEN FILE ===")
 
-    # Read the saved file
+    # Read both files once; every check below works on these lists
     with open('current_output.2da', 'r') as f:
         current_lines = f.readlines()
 
-    # Read the broken file
     with open('Skills broken newest.2da', 'r') as f:
         broken_lines = f.readlines()
 
+    # Stripped copies of the lines compared below, computed once
+    current_stripped = [line.strip() for line in current_lines[2:5]]
+    broken_stripped = [line.strip() for line in broken_lines[2:5]]
+
     print("Current header:")
-    print(repr(current_lines[2].strip()))
+    print(repr(current_stripped[0]))
     print("\nBroken header:")
-    print(repr(broken_lines[2].strip()))
-    print(f"\nHeaders match: {current_lines[2].strip() == broken_lines[2].strip()}")
+    print(repr(broken_stripped[0]))
+    print(f"\nHeaders match: {current_stripped[0] == broken_stripped[0]}")
 
     print("\nCurrent data line 1:")
-    print(repr(current_lines[3].strip()))
+    print(repr(current_stripped[1]))
     print("\nBroken data line 1:")
-    print(repr(broken_lines[3].strip()))
-    print(f"\nData lines match: {current_lines[3].strip() == broken_lines[3].strip()}")
+    print(repr(broken_stripped[1]))
+    print(f"\nData lines match: {current_stripped[1] == broken_stripped[1]}")
 
     print("\nCurrent data line 2:")
-    print(repr(current_lines[4].strip()))
+    print(repr(current_stripped[2]))
     print("\nBroken data line 2:")
-    print(repr(broken_lines[4].strip()))
-    print(f"\nData lines 2 match: {current_lines[4].strip() == broken_lines[4].strip()}")
+    print(repr(broken_stripped[2]))
+    print(f"\nData lines 2 match: {current_stripped[2] == broken_stripped[2]}")
 
     # Check alignment by comparing positions
     if len(current_lines) > 3 and len(broken_lines) > 3:
-        current_data = current_lines[3].strip()
-        broken_data = broken_lines[3].strip()
+        current_header = current_lines[2]
+        broken_header = broken_lines[2]
 
         # Check key alignment points
         alignment_checks = [
@@ -78,9 +81,10 @@ def test_column_insertion_alignment():
 
         print("\n=== ALIGNMENT CHECK ===")
         for header_text, data_hint in alignment_checks:
-            if header_text in current_lines[2] and header_text in broken_lines[2]:
-                current_pos = current_lines[2].find(header_text)
-                broken_pos = broken_lines[2].find(header_text)
+            # A single find() per line both tests for the column and locates it
+            current_pos = current_header.find(header_text)
+            broken_pos = broken_header.find(header_text)
+            if current_pos != -1 and broken_pos != -1:
                 match = current_pos == broken_pos
                 print(f"{header_text}: Current pos={current_pos}, Broken pos={broken_pos}, Match={match}")
 
@@ -88,7 +92,7 @@ def test_column_insertion_alignment():
     if os.path.exists('current_output.2da'):
         os.remove('current_output.2da')
 
-    return current_lines[2].strip() == broken_lines[2].strip() and current_lines[3].strip() == broken_lines[3].strip()
+    return current_stripped[0] == broken_stripped[0] and current_stripped[1] == broken_stripped[1]
 
 if __name__ == "__main__":
     success = test_column_insertion_alignment()
@@ -1,14 +1,65 @@
 # data/twoda.py
 from dataclasses import dataclass, field
-from typing import List, Tuple
-import re
+from itertools import chain
+from typing import List, Optional, Tuple
+import mmap
+
+
+def _locate_spans(line: str) -> List[Tuple[int, int]]:
+    # split() and find() scan the line in C. A token never contains whitespace,
+    # so the first match of it after the previous token is its span.
+    spans: List[Tuple[int, int]] = []
+    find = line.find
+    end = 0
+    for tok in line.split():
+        start = find(tok, end)
+        end = start + len(tok)
+        spans.append((start, end))
+    return spans
 
 
-@dataclass
 class TwoDARow:
-    raw: str
-    fields: List[str]
-    spans: List[Tuple[int, int]]
+    """
+    A tokenized 2DA line: the raw text, its fields, and the (start, end) span of
+    each field in raw. When spans are not given they are located from raw on
+    first access, so loading a file only splits each line.
+    """
+
+    # Fixed slots instead of a per-instance __dict__: a file holds one of these
+    # per line. _linesep is only set on formats produced by load_2da.
+    __slots__ = ("raw", "fields", "_spans", "_trailing_ws", "_linesep")
+
+    def __init__(self, raw: str, fields: List[str], spans: Optional[List[Tuple[int, int]]] = None):
+        self.raw = raw
+        self.fields = fields
+        self._spans = spans
+        self._trailing_ws = None
+
+    @property
+    def spans(self) -> List[Tuple[int, int]]:
+        if self._spans is None:
+            self._spans = _locate_spans(self.raw)
+        return self._spans
+
+    @spans.setter
+    def spans(self, value: List[Tuple[int, int]]):
+        self._spans = value
+
+    @property
+    def trailing_ws(self) -> str:
+        # Whitespace after the last token of raw, measured once per line
+        if self._trailing_ws is None:
+            raw = self.raw or ""
+            self._trailing_ws = raw[len(raw.rstrip()):]
+        return self._trailing_ws
+
+    def __repr__(self):
+        return f"TwoDARow(raw={self.raw!r}, fields={self.fields!r}, spans={self.spans!r})"
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.raw, self.fields, self.spans) == (other.raw, other.fields, other.spans)
 
 
 @dataclass
@@ -24,30 +75,26 @@ class TwoDAData:
 
 
 def parse_raw_line(line: str) -> TwoDARow:
-    spans: List[Tuple[int, int]] = []
-    fields: List[str] = []
-
-    for m in re.finditer(r"\S+", line):
-        start, end = m.start(), m.end()
-        spans.append((start, end))
-        fields.append(line[start:end])
-
-    return TwoDARow(raw=line, fields=fields, spans=spans)
+    # Fields only; spans are located lazily (see TwoDARow.spans).
+    return TwoDARow(raw=line, fields=line.split())
 
 
 def load_2da(path: str) -> TwoDAData:
-    # Read raw bytes to detect line endings
+    # Map the file instead of reading it, so line endings are detected and the
+    # text decoded straight from the page cache without an extra bytes copy.
     with open(path, "rb") as f:
-        raw_data = f.read()
-
-    # Detect line ending
-    if b'\r\n' in raw_data:
-        linesep = '\r\n'
-        text_data = raw_data.decode('utf-8').replace('\r\n', '\n')
-    else:
-        linesep = '\n'
-        text_data = raw_data.decode('utf-8')
+        if f.seek(0, 2) == 0:
+            # mmap refuses empty files
+            linesep = '\n'
+            text_data = ''
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Detect line ending
+                linesep = '\r\n' if mm.find(b'\r\n') != -1 else '\n'
+                with memoryview(mm) as view:
+                    text_data = str(view, 'utf-8')
 
+    # splitlines() already treats \r\n as a single break, no need to normalize first
     lines = text_data.splitlines()
 
     # Version
@@ -62,13 +109,22 @@ def load_2da(path: str) -> TwoDAData:
         lines.pop(0)
         empty_count += 1
 
-    parsed = [parse_raw_line(line) for line in lines if line.strip()]
+    # isspace() tests for blank lines without allocating a stripped copy of each one
+    parsed = [parse_raw_line(line) for line in lines if line and not line.isspace()]
     if not parsed:
         raise ValueError("Empty or invalid 2DA")
 
     header_fmt = parsed[0]
     row_fmt_list = parsed[1:]
 
+    # Cell values repeat heavily (mostly "****"); let every row share a single
+    # str object per distinct value instead of one allocation per cell.
+    pool = {}
+    share = pool.setdefault
+    for fmt in row_fmt_list:
+        fmt.fields = [share(v, v) for v in fmt.fields]
+
+    # The formats keep their own field lists: callers edit row_fields in place.
     header_fields = header_fmt.fields.copy()
     row_fields = [r.fields.copy() for r in row_fmt_list]
 
@@ -94,7 +150,8 @@ def save_2da(path: str, data: TwoDAData):
     linesep = getattr(data.header_format, "_linesep", "\n")
 
     header = list(data.header_fields or [])
-    rows = [list(r) for r in (data.row_fields or [])]
+    # Rows are only read here; normalization below builds fresh lists.
+    rows = data.row_fields or []
 
     # If there is no header, there's nothing sensible to write
     if not header:
@@ -110,10 +167,14 @@ def save_2da(path: str, data: TwoDAData):
         s = str(v)
         return "****" if s == "" else s
 
+    # Cells are normally all str (None for cleared ones). Check that once for the
+    # whole table so the common case skips the per-cell norm_cell() call.
+    plain_cells = {str, type(None)}.issuperset(map(type, chain.from_iterable(rows)))
+
     # Normalize rows to the expected length: [index] + n header columns
     norm_rows = []
     for i, r in enumerate(rows):
-        r = [norm_cell(x) for x in r]
+        r = [x or "****" for x in r] if plain_cells else [norm_cell(x) for x in r]
 
         if not r:
             r = [str(i)]
@@ -127,27 +188,22 @@ def save_2da(path: str, data: TwoDAData):
 
         norm_rows.append(r)
 
+    # Widths are per-column reductions, so transpose the (now rectangular) rows
+    # once and reduce each column in one pass instead of indexing every row per column.
+    columns = list(zip(*norm_rows)) or [()] * target_row_len
+
     # Compute widths for real data columns (excluding index)
-    col_widths = []
-    for j in range(n_cols):
-        maxw = len(header[j])
-        for r in norm_rows:
-            maxw = max(maxw, len(r[j + 1]))
-        col_widths.append(maxw)
+    col_widths = [max(len(h), max(map(len, col), default=0)) for h, col in zip(header, columns[1:])]
 
     # Index column width (for padding index values only)
-    idx_width = max(1, max((len(r[0]) for r in norm_rows), default=1))
+    idx_width = max(1, max(map(len, columns[0]), default=1))
 
-    def format_data_fields(fields_1_to_n):
-        # Single-space separator, with padding to column widths.
-        # (This matches the ?no extra phantom header column? requirement and prevents the drift.)
-        parts = []
-        for j, val in enumerate(fields_1_to_n):
-            if j == n_cols - 1:
-                parts.append(val)
-            else:
-                parts.append(val.ljust(col_widths[j]))
-        return " ".join(parts)
+    # Single-space separator, with padding to column widths; the last column is
+    # written as-is. (This matches the ?no extra phantom header column? requirement
+    # and prevents the drift.) The widths are fixed for the whole file, so bake
+    # them into printf-style templates once and format each line in one C call.
+    fields_template = "".join("%%-%ds " % w for w in col_widths[:-1]) + "%s"
+    row_template = "%%-%ds " % idx_width + fields_template
 
 
     out_lines = []
@@ -164,27 +220,36 @@ def save_2da(path: str, data: TwoDAData):
     # For loaded files (like feat.2da), leading_prefix(...) preserves the original exact gap.
     hdr_prefix = leading_prefix(data.header_format, fallback=(" " * (idx_width + 1)))
 
-    out_lines.append(hdr_prefix + format_data_fields([norm_cell(h) for h in header]) + hdr_suffix)
+    out_lines.append(hdr_prefix + fields_template % tuple(norm_cell(h) for h in header) + hdr_suffix)
 
 
-    # Data rows: preserve original trailing whitespace per row (if any)
-    for i, r in enumerate(norm_rows):
-        idx = r[0].ljust(idx_width)  # keep padding (no rstrip)
-        if i < len(data.row_formats):
-            suffix = trailing_suffix(data.row_formats[i])
-        elif data.row_formats:
-            suffix = trailing_suffix(data.row_formats[-1])
-        else:
-            suffix = ""
-        out_lines.append(idx + " " + format_data_fields(r[1:]) + suffix)
-        
+    # Data rows: preserve original trailing whitespace per row (if any).
+    # Resolve all suffixes up front so the row loop has no per-row branching:
+    # rows past the end of the original file reuse its last row's suffix.
+    row_formats = data.row_formats or []
+    suffixes = [trailing_suffix(fmt) for fmt in row_formats[:len(norm_rows)]]
+    if len(suffixes) < len(norm_rows):
+        extra_suffix = suffixes[-1] if suffixes else ""
+        suffixes.extend([extra_suffix] * (len(norm_rows) - len(suffixes)))
+
+    # The index is padded too (no rstrip)
+    for r, suffix in zip(norm_rows, suffixes):
+        out_lines.append(row_template % tuple(r) + suffix)
 
+    # An empty last entry makes join() emit the final line ending itself, so the
+    # whole file is built and encoded once and handed to a single write().
+    out_lines.append("")
+    payload = linesep.join(out_lines).encode("utf-8")
 
     with open(path, "wb") as f:
-        f.write((linesep.join(out_lines) + linesep).encode("utf-8"))
+        f.write(payload)
 
 def trailing_suffix(fmt) -> str:
     # Preserve exactly what was after the last token in the original raw line (usually spaces).
+    if isinstance(fmt, TwoDARow) and fmt._spans is None:
+        # Spans not located yet: rstrip() uses the same whitespace rules as split(),
+        # so this gives the same suffix without locating every token.
+        return fmt.trailing_ws if fmt.fields else ""
     if fmt and getattr(fmt, "spans", None):
         return fmt.raw[fmt.spans[-1][1]:]
     return ""
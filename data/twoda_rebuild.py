@@ -4,13 +4,44 @@ Line rebuilding functions for 2DA files.
 These functions handle various strategies for rebuilding 2DA file lines
 while preserving formatting and alignment.
 """
+from itertools import chain, zip_longest
 from typing import List, Tuple, Optional
 from .twoda import TwoDARow, TwoDAData
 
 
+def _canvas(raw: str, size: int, texts: List[str]):
+    """
+    Return a size-long line buffer holding raw (cut to size) padded with spaces.
+    When raw and every text to be placed are ASCII this is a bytearray, filled and
+    decoded in C; otherwise a list of characters, so positions stay per character.
+    """
+    raw = raw[:size]
+    if raw.isascii() and all(map(str.isascii, texts)):
+        buf = bytearray(raw, "ascii")
+        buf += b" " * (size - len(raw))
+        return buf
+    buf = list(raw)
+    buf += " " * (size - len(raw))
+    return buf
+
+
+def _overlay(buf, pos: int, text: str) -> None:
+    """Write text into a _canvas() buffer at pos, dropping anything past its end."""
+    end = min(pos + len(text), len(buf))
+    if pos < end:
+        chunk = text[:end - pos]
+        buf[pos:end] = chunk.encode("ascii") if isinstance(buf, bytearray) else chunk
+
+
+def _render(buf) -> str:
+    """Turn a _canvas() buffer back into a string."""
+    return buf.decode("ascii") if isinstance(buf, bytearray) else "".join(buf)
+
+
 def rebuild_line(fmt: TwoDARow, new_fields: List[str], header_fmt: TwoDARow = None) -> str:
     """Rebuild line allowing fields to expand by compressing inter-field whitespace first."""
-    if not fmt.spans:
+    spans = fmt.spans
+    if not spans:
         return fmt.raw
 
     # Rebuild line with whitespace compression for field expansion
@@ -18,30 +49,31 @@ def rebuild_line(fmt: TwoDARow, new_fields: List[str], header_fmt: TwoDARow = No
     orig_line = fmt.raw
     result_parts = []
 
-    for i, ((start, end), value) in enumerate(zip(fmt.spans, new_fields)):
+    # The previous field's span start and new value are carried along instead of
+    # being looked up again through spans / new_fields on every iteration.
+    prev_start = 0
+    prev_value = None
+
+    for i, ((start, end), value) in enumerate(zip(spans, new_fields)):
         if i == 0:
             # Spaces before first field
             spaces_before = start
         else:
-            # Spaces between this field and previous
-            prev_end = fmt.spans[i-1][1]
-            orig_spaces = start - prev_end
-
-            # Check if previous field expanded
-            prev_value = new_fields[i-1]
-            prev_orig_end = fmt.spans[i-1][1]
-            prev_orig_start = fmt.spans[i-1][0]
-            prev_expansion = len(prev_value) - (prev_orig_end - prev_orig_start)
-
-            # Compress whitespace by the amount of previous expansion
-            spaces_before = max(1, orig_spaces - prev_expansion)
+            # Original gap to the previous field, compressed by however much the
+            # previous field expanded:
+            #   (start - prev_end) - (len(prev_value) - (prev_end - prev_start))
+            spaces_before = start - prev_start - len(prev_value)
+            if spaces_before < 1:
+                spaces_before = 1
 
         result_parts.append(' ' * spaces_before)
         result_parts.append(value)
+        prev_start = start
+        prev_value = value
 
     # Add everything after the last field
-    if fmt.spans:
-        last_end = fmt.spans[-1][1]
+    if spans:
+        last_end = spans[-1][1]
         result_parts.append(orig_line[last_end:])
 
     result_str = ''.join(result_parts)
@@ -59,15 +91,15 @@ def _orig_widths_from_spans(fmt) -> List[int]:
     if not fmt or not getattr(fmt, "spans", None):
         return []
 
-    widths: List[int] = []
     spans = fmt.spans
 
-    for i, (start, end) in enumerate(spans):
-        if i < len(spans) - 1:
-            next_start = spans[i + 1][0]
-            widths.append(max(1, next_start - start - 1))
-        else:
-            widths.append(max(1, end - start))
+    # Work on the start offsets as their own list and pair each with the next one,
+    # rather than indexing back into the span tuples for every column.
+    starts = [start for start, _ in spans]
+    widths: List[int] = [max(1, next_start - start - 1) for start, next_start in zip(starts, starts[1:])]
+
+    last_start, last_end = spans[-1]
+    widths.append(max(1, last_end - last_start))
 
     return widths
 
@@ -79,17 +111,27 @@ def rebuild_line_with_header_alignment(fmt, fields: List[str], widths: List[int]
 
 def calculate_column_widths(data) -> Tuple[List[int], List[int]]:
     hdr_orig = _orig_widths_from_spans(getattr(data, "header_format", None))
-    row_orig = _orig_widths_from_spans(data.row_formats[0]) if getattr(data, "row_formats", None) else []
+    row_formats = getattr(data, "row_formats", None)
+    row_orig = _orig_widths_from_spans(row_formats[0]) if row_formats else []
+
+    rows = getattr(data, "row_fields", [])
+
+    # Cells are normally all str; only convert them with str() when some are not.
+    all_str = {str}.issuperset(map(type, chain.from_iterable(rows)))
+
+    # Max content length per row column (including index col at 0).
+    # Transpose once so each column is reduced by max()/map() in C; short rows
+    # are padded with "" to match the widest one.
+    maxlen: List[int] = [
+        max(map(len, column if all_str else map(str, column)))
+        for column in zip_longest(*rows, fillvalue="")
+    ]
 
-    # Determine row column count
-    cols = max((len(r) for r in getattr(data, "row_fields", [])), default=0)
+    # Row column count: the transpose above already ran to the longest row
+    cols = len(maxlen)
 
-    # Max content length per row column (including index col at 0)
-    maxlen: List[int] = [0] * cols
-    for r in getattr(data, "row_fields", []):
-        for c in range(cols):
-            v = r[c] if c < len(r) else ""
-            maxlen[c] = max(maxlen[c], len(str(v)))
+    # Header name lengths, measured once and shared by both width passes
+    header_lens = [len(str(h)) for h in getattr(data, "header_fields", [])]
 
     # Data widths (rows) include index column at 0
     data_widths: List[int] = [0] * cols
@@ -98,26 +140,27 @@ def calculate_column_widths(data) -> Tuple[List[int], List[int]]:
 
         # Preserve original row layout widths where available
         if c < len(row_orig):
-            base = max(base, row_orig[c])
+            if row_orig[c] > base:
+                base = row_orig[c]
         else:
             # New column beyond original spans: ensure at least header name length (if it maps)
             j = c - 1  # row col 1.. maps to header_fields 0..
-            if c > 0 and j < len(getattr(data, "header_fields", [])):
-                base = max(base, len(str(data.header_fields[j])))
+            if c > 0 and j < len(header_lens) and header_lens[j] > base:
+                base = header_lens[j]
 
         data_widths[c] = base
 
     # Header widths (no index column)
     header_widths: List[int] = []
-    header_fields = getattr(data, "header_fields", [])
 
-    for j, h in enumerate(header_fields):
+    for j, base in enumerate(header_lens):
         c = j + 1  # maps to row column
-        base = max(len(str(h)), maxlen[c] if c < len(maxlen) else 0)
+        if c < cols and maxlen[c] > base:
+            base = maxlen[c]
 
         # Preserve original header layout widths where available
-        if j < len(hdr_orig):
-            base = max(base, hdr_orig[j])
+        if j < len(hdr_orig) and hdr_orig[j] > base:
+            base = hdr_orig[j]
 
         header_widths.append(base)
 
@@ -126,65 +169,51 @@ def calculate_column_widths(data) -> Tuple[List[int], List[int]]:
 
 def rebuild_line_with_expansion(fmt: TwoDARow, fields: List[str], header_fmt: TwoDARow) -> str:
     """Rebuild data line allowing expansion that shifts subsequent columns."""
-    if not fields or not header_fmt.spans:
+    if not fields:
         return fmt.raw or ""
 
-    # Create result with enough space
-    max_len = len(fmt.raw or "") + sum(len(field) for field in fields)
-    result = [' '] * max_len
+    # Span lists are computed lazily on TwoDARow; look them up once per call
+    hspans = header_fmt.spans
+    if not hspans:
+        return fmt.raw or ""
+    spans = fmt.spans
 
-    # Copy original line content first
-    if fmt.raw:
-        for i, char in enumerate(fmt.raw):
-            if i < len(result):
-                result[i] = char
+    # Create result with enough space, starting from the original line content
+    raw = fmt.raw or ""
+    field_lens = list(map(len, fields))
+    max_len = len(raw) + sum(field_lens)
+    result = _canvas(raw, max_len, fields)
 
     # Track current position offset due to expansions
     offset = 0
 
     # Index column (first field) stays at its original position
-    if fields and fmt.spans:
-        index_span = fmt.spans[0]
+    if fields and spans:
+        index_span = spans[0]
         index_value = fields[0]
         orig_width = index_span[1] - index_span[0]
         index_text = index_value[:orig_width].ljust(orig_width)
+        _overlay(result, index_span[0], index_text)
 
-        for j, char in enumerate(index_text):
-            pos = index_span[0] + j
-            if pos < len(result):
-                result[pos] = char
+    # Align data fields with header positions, but allow expansion.
+    # Data field i sits under header span i-1; zip() stops at whichever runs out.
+    for (header_start, header_end), field_value, actual_width in zip(hspans, fields[1:], field_lens[1:]):
+        # Apply current offset to the header position
+        actual_start = header_start + offset
 
-    # Align data fields with header positions, but allow expansion
-    for i in range(1, len(fields)):
-        if i-1 < len(header_fmt.spans):
-            header_span = header_fmt.spans[i-1]
-            header_start = header_span[0]
+        # Place the field at the offset position
+        _overlay(result, actual_start, field_value)
 
-            # Apply current offset to the header position
-            actual_start = header_start + offset
-
-            # Get the data field value
-            field_value = fields[i]
-
-            # Place the field at the offset position
-            for j, char in enumerate(field_value):
-                pos = actual_start + j
-                if pos < len(result):
-                    result[pos] = char
-
-            # Calculate how much this field expanded beyond the header width
-            header_width = header_span[1] - header_span[0]
-            actual_width = len(field_value)
-            expansion = max(0, actual_width - header_width)
-            offset += expansion
+        # Calculate how much this field expanded beyond the header width
+        header_width = header_end - header_start
+        if actual_width > header_width:
+            offset += actual_width - header_width
 
     # Trim and preserve trailing whitespace
-    result_str = ''.join(result).rstrip()
+    result_str = _render(result).rstrip()
 
     # Preserve original trailing whitespace pattern
-    orig_line = fmt.raw or ""
-    last_content_pos = len(orig_line.rstrip())
-    orig_trailing = orig_line[last_content_pos:]
+    orig_trailing = fmt.trailing_ws
 
     if orig_trailing:
         result_str += orig_trailing
@@ -200,7 +229,7 @@ def rebuild_line_with_calculated_positions(fmt: TwoDARow, fields: List[str], col
     # For 2DA expansion, create a line that accommodates the calculated widths
     # Position fields at cumulative positions based on column widths
     total_width = sum(column_widths)
-    result = [' '] * (total_width + 10)  # Extra space for safety
+    result = _canvas("", total_width + 10, fields)  # Extra space for safety
 
     current_pos = 0
     for i, value in enumerate(fields):
@@ -211,21 +240,16 @@ def rebuild_line_with_calculated_positions(fmt: TwoDARow, fields: List[str], col
 
         # Place the field, allowing it to be longer than the allocated width
         actual_len = len(value)
-        for j, char in enumerate(value):
-            pos = current_pos + j
-            if pos < len(result):
-                result[pos] = char
+        _overlay(result, current_pos, value)
 
         # Move to next column position (maintain minimum spacing)
-        current_pos += max(width, actual_len)
+        current_pos += width if width > actual_len else actual_len
 
     # Trim and preserve original trailing whitespace
-    result_str = ''.join(result).rstrip()
+    result_str = _render(result).rstrip()
 
     # Preserve original trailing whitespace pattern
-    orig_line = fmt.raw or ""
-    last_content_pos = len(orig_line.rstrip())
-    orig_trailing = orig_line[last_content_pos:]
+    orig_trailing = fmt.trailing_ws
 
     if orig_trailing:
         result_str += orig_trailing
@@ -241,24 +265,25 @@ def rebuild_line_dynamic(fmt, fields: List[str], widths: List[int],
     - fixed widths + single-space separators.
     """
     prefix = ""
-    if preserve_spacing and fmt and getattr(fmt, "spans", None):
-        prefix = fmt.raw[:fmt.spans[0][0]]
+    spans = getattr(fmt, "spans", None) if preserve_spacing and fmt else None
+    if spans:
+        prefix = fmt.raw[:spans[0][0]]
 
     sep = " "
-    out: List[str] = [prefix]
-    n = len(fields)
+    cells: List[str] = []
+    last = len(fields) - 1
 
     for i, val in enumerate(fields):
         s = "" if val is None else str(val)
-        w = widths[i] if i < len(widths) else len(s)
 
-        if i < n - 1:
-            out.append(s.ljust(w))
-            out.append(sep)
+        if i < last:
+            w = widths[i] if i < len(widths) else len(s)
+            cells.append(s.ljust(w))
         else:
-            out.append(s)
+            cells.append(s)
 
-    return "".join(out).rstrip()
+    # One join with the separator instead of appending it after every cell
+    return (prefix + sep.join(cells)).rstrip()
 
 
 
@@ -269,18 +294,21 @@ def extend_format_for_new_columns_smart(fmt: TwoDARow, new_fields: List[str], co
     This tries to maintain the visual structure by using header positions when available,
     or analyzing spacing patterns from existing spans.
     """
-    if len(new_fields) <= len(fmt.spans):
+    spans = fmt.spans
+    raw = fmt.raw or ""
+    if len(new_fields) <= len(spans):
         return fmt
 
     # If we have a header format, try to align with it
-    if header_fmt and len(new_fields) <= len(header_fmt.spans) + 1:  # +1 for index column
+    hspans = header_fmt.spans if header_fmt else None
+    if header_fmt and len(new_fields) <= len(hspans) + 1:  # +1 for index column
         # Use header positions to determine data column positions
         extended_spans = []
         extended_fields = []
 
         # Index column (first field) - keep original position if available
-        if fmt.spans:
-            extended_spans.append(fmt.spans[0])
+        if spans:
+            extended_spans.append(spans[0])
             extended_fields.append(new_fields[0])
         else:
             # Default position for index column
@@ -289,8 +317,8 @@ def extend_format_for_new_columns_smart(fmt: TwoDARow, new_fields: List[str], co
 
         # Add spans based on header positions for data columns
         for i in range(1, len(new_fields)):
-            if i-1 < len(header_fmt.spans):
-                header_span = header_fmt.spans[i-1]
+            if i-1 < len(hspans):
+                header_span = hspans[i-1]
                 # Use header start position, but adjust width based on data
                 start = header_span[0]
                 field_width = len(new_fields[i])
@@ -307,23 +335,15 @@ def extend_format_for_new_columns_smart(fmt: TwoDARow, new_fields: List[str], co
                     extended_fields.append(new_fields[i])
 
         # Create raw line
-        max_len = max(extended_spans[-1][1] + 10 if extended_spans else 50, len(fmt.raw or ""))
-        result_parts = [' '] * max_len
-
-        # Copy original content if available
-        if fmt.raw:
-            for j, char in enumerate(fmt.raw):
-                if j < len(result_parts):
-                    result_parts[j] = char
+        max_len = max(extended_spans[-1][1] + 10 if extended_spans else 50, len(raw))
+        # Start from the original content, if available
+        result_parts = _canvas(raw, max_len, extended_fields)
 
         # Place fields at their span positions
         for (start, end), field_value in zip(extended_spans, extended_fields):
-            for j, char in enumerate(field_value):
-                pos = start + j
-                if pos < len(result_parts):
-                    result_parts[pos] = char
+            _overlay(result_parts, start, field_value)
 
-        raw_line = ''.join(result_parts).rstrip()
+        raw_line = _render(result_parts).rstrip()
 
         return TwoDARow(
             raw=raw_line,
@@ -333,7 +353,7 @@ def extend_format_for_new_columns_smart(fmt: TwoDARow, new_fields: List[str], co
 
     # Fallback: use original logic for cases where header alignment isn't available
     # Start with the original spans
-    extended_spans = list(fmt.spans)
+    extended_spans = list(spans)
     extended_fields = list(fmt.fields) if fmt.fields else []
 
     # Find the end position of the last original span
@@ -343,13 +363,9 @@ def extend_format_for_new_columns_smart(fmt: TwoDARow, new_fields: List[str], co
 
     # Analyze spacing pattern from existing spans
     if len(extended_spans) >= 2:
-        # Calculate average spacing between columns
-        spacings = []
-        for i in range(1, len(extended_spans)):
-            spacing = extended_spans[i][0] - extended_spans[i-1][1]
-            spacings.append(spacing)
-
-        avg_spacing = sum(spacings) / len(spacings) if spacings else 2
+        # Calculate average spacing between columns (there are at least two here)
+        total_gap = sum(nxt[0] - cur[1] for cur, nxt in zip(extended_spans, extended_spans[1:]))
+        avg_spacing = total_gap / (len(extended_spans) - 1)
         # Use a reasonable spacing (not too compressed)
         spacing = max(1, int(avg_spacing))
     else:
@@ -357,7 +373,7 @@ def extend_format_for_new_columns_smart(fmt: TwoDARow, new_fields: List[str], co
 
     # Add spans for the new columns
     current_pos = last_end
-    for i in range(len(fmt.spans), len(new_fields)):
+    for i in range(len(spans), len(new_fields)):
         field_value = new_fields[i]
 
         # Use column width if available, otherwise use field length
@@ -378,22 +394,16 @@ def extend_format_for_new_columns_smart(fmt: TwoDARow, new_fields: List[str], co
 
     # Create a new raw line that represents the extended format
     max_len = current_pos + 10
-    result_parts = [' '] * max_len
+    added_fields = new_fields[len(spans):]
 
-    # Copy original content if available
-    if fmt.raw:
-        for j, char in enumerate(fmt.raw):
-            if j < len(result_parts):
-                result_parts[j] = char
+    # Start from the original content (cut to max_len), if available
+    result_parts = _canvas(raw, max_len, added_fields)
 
     # Add the new fields
-    for (start, end), field_value in zip(extended_spans[len(fmt.spans):], new_fields[len(fmt.spans):]):
-        for j, char in enumerate(field_value):
-            pos = start + j
-            if pos < len(result_parts):
-                result_parts[pos] = char
+    for (start, end), field_value in zip(extended_spans[len(spans):], added_fields):
+        _overlay(result_parts, start, field_value)
 
-    raw_line = ''.join(result_parts).rstrip()
+    raw_line = _render(result_parts).rstrip()
 
     return TwoDARow(
         raw=raw_line,
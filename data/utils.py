@@ -1,11 +1,11 @@
 # data/utils.py
 
-import re
 from typing import List
 
 def read_2da_lines(path: str) -> List[str]:
+    # Stream the file; splitlines() per line keeps its extra separators (\v, \x85, ...)
     with open(path, encoding="utf-8") as f:
-        lines = f.read().splitlines()
+        lines = [part for line in f for part in line.splitlines()]
     if lines and lines[0].startswith("2DA"):
         return lines[1:]
     return lines
@@ -15,9 +15,8 @@ def parse_2da_rows(lines: List[str]) -> List[List[str]]:
     for line in lines:
         if not line.strip():
             continue
-        cleaned = line.rstrip()
-        parts = re.split(r"\s+", cleaned.strip())
-        parsed.append(parts)
+        # Without arguments split() drops surrounding whitespace and splits on runs
+        parsed.append(line.split())
     return parsed
 
 def detect_index_column(header: List[str], rows: List[List[str]]) -> List[str]:
@@ -2,6 +2,8 @@
 """
 Debug script to understand how column insertion works at the model level
 """
+from itertools import islice
+
 from gui.table_model import TwoDATableModel
 
 def debug_model_insertion():
@@ -55,9 +57,11 @@ def debug_model_insertion():
     from data.twoda import save_2da
     save_2da('debug_model_output.2da', save_data)
 
+    # Only the header (line 2) and first data row (line 3) are compared, so read
+    # no further than those
     print("\n=== SAVED FILE CONTENT ===")
     with open('debug_model_output.2da', 'r') as f:
-        lines = f.readlines()
+        lines = list(islice(f, 4))
         print("Header line:")
         print(repr(lines[2].strip()))
         print("Data line 1:")
@@ -66,7 +70,7 @@ def debug_model_insertion():
     # Compare with broken file
     print("\n=== COMPARISON WITH BROKEN ===")
     with open('Skills broken newest.2da', 'r') as f:
-        broken_lines = f.readlines()
+        broken_lines = list(islice(f, 4))
         print("Broken header:")
         print(repr(broken_lines[2].strip()))
         print("Broken data 1:")
@@ -4,6 +4,7 @@ Debug single character addition.
 """
 import sys
 import os
+from itertools import islice
 
 # Add the data directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'data'))
@@ -26,18 +27,18 @@ def test_single_char():
 
     save_2da(test_file, data)
 
-    # Check result
+    # Check result: line 3 is the first data row, so stop reading once it is reached
     with open(test_file, 'r') as f:
-        lines = f.readlines()
+        data_line = next(islice(f, 3, None))
 
-    result_row = lines[3].rstrip()  # Line 3 is first data row
+    result_row = data_line.rstrip()
     print("Result row:  ", repr(result_row))
-    print("Full result: ", repr(lines[3]))
+    print("Full result: ", repr(data_line))
 
     # Compare lengths
     print(f"Original length: {len(orig_row)}")
     print(f"Result length: {len(result_row)}")
-    print(f"Full result length: {len(lines[3])}")
+    print(f"Full result length: {len(data_line)}")
 
     # Check positions of key elements
     print("\nPosition analysis:")
@@ -1,5 +1,4 @@
 from PyQt5.QtWidgets import QUndoCommand
-from PyQt5.QtCore import Qt
 from typing import List, Tuple
 
 
@@ -14,6 +13,11 @@ class CellEditCommand(QUndoCommand):
         self.old_text = old_text
         self.new_text = new_text
 
+        # A same-value edit has nothing to undo; QUndoStack drops obsolete
+        # commands right after pushing them instead of recording an entry
+        if old_text == new_text:
+            self.setObsolete(True)
+
     def undo(self):
         self.model.set_cell(
             self.row,
@@ -24,6 +28,8 @@ class CellEditCommand(QUndoCommand):
         self._mark_dirty()
 
     def redo(self):
+        if self.isObsolete():
+            return
         self.model.set_cell(
             self.row,
             self.col,
@@ -33,10 +39,7 @@ class CellEditCommand(QUndoCommand):
         self._mark_dirty()
 
     def _mark_dirty(self):
-        self.document.is_dirty = True
-        mw = self.document.window()
-        if mw and hasattr(mw, "update_tab_title"):
-            mw.update_tab_title(self.document)
+        self.document._mark_dirty()
 
 
 class MultiCellClearCommand(QUndoCommand):
@@ -48,30 +51,26 @@ class MultiCellClearCommand(QUndoCommand):
         self.document = document
         self.model = document.model
         self.cells_to_clear = cells_to_clear
-        self.old_values = []  # List of (row, col, old_value)
 
-        # Capture old values
-        for row, col in self.cells_to_clear:
-            old_value = self.model.data(self.model.index(row, col), Qt.DisplayRole)
-            if old_value is None:
-                old_value = ""
-            self.old_values.append((row, col, str(old_value)))
+        # Capture old values (list of (row, col, old_value)) in one pass over the rows
+        self.old_values = [
+            (row, col, old_value)
+            for (row, col), old_value in zip(self.cells_to_clear, self.model.get_cells(self.cells_to_clear))
+        ]
 
     def undo(self):
-        for row, col, old_value in self.old_values:
-            self.model.set_cell(row, col, old_value, emit_edit_signal=False)
+        self.model.set_cells(self.old_values, emit_edit_signal=False)
         self._mark_dirty()
 
     def redo(self):
-        for row, col, _ in self.old_values:
-            self.model.set_cell(row, col, "", emit_edit_signal=False)
+        self.model.set_cells(
+            [(row, col, "") for row, col, _ in self.old_values],
+            emit_edit_signal=False
+        )
         self._mark_dirty()
 
     def _mark_dirty(self):
-        self.document.is_dirty = True
-        mw = self.document.window()
-        if mw and hasattr(mw, "update_tab_title"):
-            mw.update_tab_title(self.document)
+        self.document._mark_dirty()
 
 
 class MultiCellFillCommand(QUndoCommand):
@@ -84,29 +83,25 @@ class MultiCellFillCommand(QUndoCommand):
         self.model = document.model
         self.cells_to_fill = cells_to_fill
         self.fill_value = fill_value
-        self.old_values = []  # List of (row, col, old_value)
 
-        # Capture old values
-        for row, col in self.cells_to_fill:
-            old_value = self.model.data(self.model.index(row, col), Qt.DisplayRole)
-            if old_value is None:
-                old_value = ""
-            self.old_values.append((row, col, str(old_value)))
+        # Capture old values (list of (row, col, old_value)) in one pass over the rows
+        self.old_values = [
+            (row, col, old_value)
+            for (row, col), old_value in zip(self.cells_to_fill, self.model.get_cells(self.cells_to_fill))
+        ]
 
     def undo(self):
-        for row, col, old_value in self.old_values:
-            self.model.set_cell(row, col, old_value, emit_edit_signal=False)
+        self.model.set_cells(self.old_values, emit_edit_signal=False)
         self._mark_dirty()
 
     def redo(self):
-        for row, col, _ in self.old_values:
-            self.model.set_cell(row, col, self.fill_value, emit_edit_signal=False)
+        self.model.set_cells(
+            [(row, col, self.fill_value) for row, col, _ in self.old_values],
+            emit_edit_signal=False
+        )
         self._mark_dirty()
 
     def _mark_dirty(self):
-        self.document.is_dirty = True
-        mw = self.document.window()
-        if mw and hasattr(mw, "update_tab_title"):
-            mw.update_tab_title(self.document)
+        self.document._mark_dirty()
 
 
@@ -1,5 +1,7 @@
 # gui/dialogs.py
 
+import re
+
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
     QCheckBox, QDialogButtonBox, QComboBox
@@ -41,3 +43,19 @@ class SearchReplaceDialog(QDialog):
             "match_case": self.case.isChecked(),
             "whole_word": self.whole.isChecked()
         }
+
+    def compiled(self):
+        """
+        Return (regex, replacement) for the accepted dialog, with the search text
+        escaped and compiled once according to the case / whole word options.
+        The regex is None when nothing was entered.
+        """
+        vals = self.values()
+        pat = vals["pattern"]
+        if not pat:
+            return None, vals["replacement"]
+
+        flags = 0 if vals["match_case"] else re.IGNORECASE
+        escaped = re.escape(pat)
+        pattern = r"\b" + escaped + r"\b" if vals["whole_word"] else escaped
+        return re.compile(pattern, flags), vals["replacement"]
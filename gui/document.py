@@ -1,6 +1,9 @@
 # gui/document.py
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QUndoStack
-from PyQt5.QtCore import QModelIndex, Qt
+from PyQt5.QtCore import QModelIndex, Qt, QEvent, QTimer
 from PyQt5.QtWidgets import QUndoCommand
 
 from .table_view import TwoDATable
@@ -9,10 +12,30 @@ from .table_model import TwoDATableModel
 
 SEARCHABLE_COL_START = 1  # 2DA rule: column 0 is structural (row label/index), do not search/replace
 
+UNDO_LIMIT = 200  # oldest undo steps (and the row/column snapshots they hold) are dropped past this
+
+CELL_DELIMITER = "\x1f"  # never appears in 2DA cells; joins a row for a single-pass prefilter
+_CONTEXT_SENSITIVE = ("^", "$", "\\A", "\\Z", "(?=", "(?!", "(?<")
+
+
+def _row_prefilter(regex):
+    """
+    Return a search callable for rejecting whole rows joined with CELL_DELIMITER,
+    or None if the pattern uses anchors/lookarounds, whose result could change
+    when a cell is no longer the whole string being searched.
+    """
+    if any(token in regex.pattern for token in _CONTEXT_SENSITIVE):
+        return None
+    return regex.search
+
 
 # -----------------------------
 # Undo commands for row ops
 # -----------------------------
+# QUndoCommand ids: consecutive commands with the same id may be merged
+INSERT_ROW_COMMAND_ID = 0xAD01
+REMOVE_ROW_COMMAND_ID = 0xAD02
+
 class InsertRowCommand(QUndoCommand):
     def __init__(self, doc, row: int, count: int = 1, label: str = "Insert Row"):
         super().__init__(label)
@@ -31,6 +54,19 @@ class InsertRowCommand(QUndoCommand):
             return
         self.doc.model.removeRows(self.row, self.count)
 
+    def id(self):
+        return INSERT_ROW_COMMAND_ID
+
+    def mergeWith(self, other):
+        # Inserting empty rows inside or right next to this block just grows it,
+        # so repeated inserts undo/redo as one block with a single model update
+        if other.text() != self.text() or not other._did_redo:
+            return False
+        if not (self.row <= other.row <= self.row + self.count):
+            return False
+        self.count += other.count
+        return True
+
 
 class RemoveRowCommand(QUndoCommand):
     def __init__(self, doc, row: int, count: int = 1, label: str = "Delete Row"):
@@ -47,7 +83,10 @@ class RemoveRowCommand(QUndoCommand):
             self._removed_rows = []
             return
         last = min(len(rows), self.row + self.count)
-        self._removed_rows = [list(r) for r in rows[self.row:last]]
+        # Keep the removed row lists themselves rather than copies: once
+        # removeRows() drops them from the model, only this command holds them,
+        # and every redo takes a fresh snapshot
+        self._removed_rows = rows[self.row:last]
         self.doc.model.removeRows(self.row, self.count)
 
     def undo(self):
@@ -57,14 +96,31 @@ class RemoveRowCommand(QUndoCommand):
         m = self.doc.model
         insert_at = max(0, min(self.row, len(m._rows)))
         m.beginInsertRows(QModelIndex(), insert_at, insert_at + len(self._removed_rows) - 1)
-        for i, row_data in enumerate(self._removed_rows):
+        for row in self._removed_rows:
             # Ensure row has at least as many cols as header
-            row = list(row_data)
-            while len(row) < len(m._header):
-                row.append("")
-            m._rows.insert(insert_at + i, row)
+            if len(row) < len(m._header):
+                row.extend([""] * (len(m._header) - len(row)))
+        m._rows[insert_at:insert_at] = self._removed_rows
         m.endInsertRows()
 
+    def id(self):
+        return REMOVE_ROW_COMMAND_ID
+
+    def mergeWith(self, other):
+        # Merge deletes that ate into the same spot: at this row (the rows below
+        # moved up) or the rows right above it
+        if other.text() != self.text() or not self._removed_rows or not other._removed_rows:
+            return False
+        if other.row == self.row:
+            self._removed_rows = self._removed_rows + other._removed_rows
+        elif other.row + len(other._removed_rows) == self.row:
+            self._removed_rows = other._removed_rows + self._removed_rows
+            self.row = other.row
+        else:
+            return False
+        self.count = len(self._removed_rows)
+        return True
+
 
 class DuplicateRowCommand(QUndoCommand):
     def __init__(self, doc, row: int, label: str = "Duplicate Row"):
@@ -160,15 +216,11 @@ class RemoveColumnCommand(QUndoCommand):
         m.beginInsertColumns(QModelIndex(), insert_at, insert_at + len(self._removed_header) - 1)
 
         # Insert headers
-        for i, header in enumerate(self._removed_header):
-            m._header.insert(insert_at + i, header)
+        m._header[insert_at:insert_at] = self._removed_header
 
-        # Insert column data into each row
-        for row_idx, row_data in enumerate(self._removed_data):
-            if row_idx < len(m._rows):
-                row = m._rows[row_idx]
-                for i, cell_data in enumerate(row_data):
-                    row.insert(insert_at + i, cell_data)
+        # Insert column data into each row (one slice assignment per row)
+        for row, row_data in zip(m._rows, self._removed_data):
+            row[insert_at:insert_at] = row_data
 
         m.endInsertColumns()
 
@@ -206,9 +258,8 @@ class DuplicateColumnCommand(QUndoCommand):
         m._header.insert(insert_at, self._copied_header)
 
         # Insert column data into each row
-        for row_idx, cell_data in enumerate(self._copied_data):
-            if row_idx < len(m._rows):
-                m._rows[row_idx].insert(insert_at, cell_data)
+        for row, cell_data in zip(m._rows, self._copied_data):
+            row.insert(insert_at, cell_data)
 
         m.endInsertColumns()
 
@@ -231,15 +282,14 @@ class RenameColumnCommand(QUndoCommand):
 
     def redo(self):
         self.doc.model.setHeaderData(self.col, Qt.Horizontal, self.new_name, Qt.EditRole)
-        # Also update the document's current_data immediately
-        header, _ = self.doc.model.extract_data()
-        self.doc.current_data.header_fields = header[1:]
+        # Also update the document's current_data immediately. Only the header is
+        # needed, so slice it directly instead of extract_data() copying every row.
+        self.doc.current_data.header_fields = self.doc.model._header[1:]
 
     def undo(self):
         self.doc.model.setHeaderData(self.col, Qt.Horizontal, self.old_name, Qt.EditRole)
         # Also update the document's current_data
-        header, _ = self.doc.model.extract_data()
-        self.doc.current_data.header_fields = header[1:]
+        self.doc.current_data.header_fields = self.doc.model._header[1:]
 
 
 class TwoDADocument(QWidget):
@@ -251,10 +301,22 @@ class TwoDADocument(QWidget):
         self.table.setModel(self.model)
 
         self.undo_stack = QUndoStack(self)
+        self.undo_stack.setUndoLimit(UNDO_LIMIT)
+        self._batch_depth = 0  # open batch_edit() blocks
         self.current_path = None
         self.current_data = None
         self.is_dirty = False
 
+        # Main window's update_tab_title, resolved on first use and dropped on reparent
+        self._tab_title_cb = None
+
+        # Title refreshes are deferred to the event loop so a burst of edits
+        # (fill, paste, undo of a macro) repaints the tab once
+        self._title_timer = QTimer(self)
+        self._title_timer.setSingleShot(True)
+        self._title_timer.setInterval(0)
+        self._title_timer.timeout.connect(self._update_tab_title)
+
         # Connect to undo stack clean state changes
         self.undo_stack.cleanChanged.connect(self._on_clean_changed)
 
@@ -262,6 +324,17 @@ class TwoDADocument(QWidget):
         self._search_regex = None
         self._search_last_row = -1
         self._search_last_col = -1
+        self._search_matches = None  # row-major (row, col) hits, built on demand
+
+        # Cell edits re-check just the changed rows; structural changes move
+        # cells around, so the cached hits are dropped and rebuilt on demand
+        self.model.dataChanged.connect(self._update_search_matches)
+        for signal in (
+            self.model.modelReset, self.model.layoutChanged,
+            self.model.rowsInserted, self.model.rowsRemoved,
+            self.model.columnsInserted, self.model.columnsRemoved,
+        ):
+            signal.connect(self._invalidate_search_matches)
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -279,6 +352,29 @@ class TwoDADocument(QWidget):
         self.table.requestDuplicateColumn.connect(self.duplicate_column)
         self.table.requestDeleteColumn.connect(self.delete_column)
 
+    # -----------------------------
+    # Undo grouping
+    # -----------------------------
+    @contextmanager
+    def batch_edit(self, label: str):
+        """Group every undo command pushed inside the block into one undo step."""
+        self._batch_depth += 1
+        self.undo_stack.beginMacro(label)
+        try:
+            yield
+        finally:
+            self.undo_stack.endMacro()
+            self._batch_depth -= 1
+            # Nothing was pushed (e.g. pasting identical values): drop the empty
+            # macro so it leaves no do-nothing undo step and keeps the clean state.
+            # Only at the top level: a nested macro is a child of the still-open
+            # outer one, and index() - 1 would be some earlier command.
+            if self._batch_depth == 0:
+                cmd = self.undo_stack.command(self.undo_stack.index() - 1)
+                if cmd is not None and cmd.text() == label and cmd.childCount() == 0:
+                    cmd.setObsolete(True)
+                    self.undo_stack.undo()
+
     # -----------------------------
     # Row operations (UNDO SAFE)
     # -----------------------------
@@ -352,53 +448,77 @@ class TwoDADocument(QWidget):
         self._search_regex = regex
         self._search_last_row = -1
         self._search_last_col = -1
+        self._search_matches = None
+
+    def _invalidate_search_matches(self, *args):
+        self._search_matches = None
+
+    def _update_search_matches(self, top_left, bottom_right, roles=()):
+        # Re-check whole rows, not just the changed columns: a write can also pad
+        # a short row with new "" cells outside the reported range
+        matches = self._search_matches
+        if matches is None:
+            return
+        first, last = top_left.row(), min(bottom_right.row(), len(self.model._rows) - 1)
+        if first < 0 or last < first:
+            return
+        lo = bisect_left(matches, (first,))
+        hi = bisect_left(matches, (last + 1,))
+        matches[lo:hi] = self._scan_search_rows(first, last + 1)
+
+    def _scan_search_rows(self, start, stop):
+        """Return the row-major (row, col) hits of the current pattern in rows [start, stop)."""
+        search = self._search_regex.search
+        row_search = _row_prefilter(self._search_regex)
+        join = CELL_DELIMITER.join
+        rows = self.model._rows
+        hits = []
+
+        for r in range(start, stop):
+            row = rows[r]
+            # One regex pass over the joined row skips rows without any hit
+            if row_search and not row_search(join(row[SEARCHABLE_COL_START:])):
+                continue
+            for c in range(SEARCHABLE_COL_START, len(row)):
+                if search(row[c]):
+                    hits.append((r, c))
+
+        return hits
+
+    def _search_match_list(self):
+        """
+        Return the (row, col) of every searchable cell matching the current pattern,
+        in row-major order. The list is built once and reused by find_next /
+        find_previous; cell edits patch it in place, structural changes drop it.
+        """
+        if self._search_matches is None:
+            self._search_matches = self._scan_search_rows(0, len(self.model._rows))
+        return self._search_matches
+
+    def _select_search_match(self, r, c):
+        self._search_last_row = r
+        self._search_last_col = c
+        idx = self.model.index(r, c)
+        self.table.setCurrentIndex(idx)
+        self.table.scrollTo(idx)
 
     def find_next(self):
         if not self._search_regex or not self.model:
             return
 
-        rows = self.model._rows
+        matches = self._search_match_list()
+        if not matches:
+            return
 
         # If no prior match, start at top-left (searchable region)
         if self._search_last_row < 0 or self._search_last_col < 0:
-            start_row = 0
-            start_col = SEARCHABLE_COL_START
+            start = (0, SEARCHABLE_COL_START)
         else:
-            start_row = self._search_last_row
-            start_col = self._search_last_col + 1
+            start = (self._search_last_row, self._search_last_col + 1)
 
-        # Forward scan
-        for r in range(start_row, len(rows)):
-            row = rows[r]
-            col_start = start_col if r == start_row else SEARCHABLE_COL_START
-            col_start = max(SEARCHABLE_COL_START, col_start)
-
-            for c in range(col_start, len(row)):
-                cell_value = row[c]
-                if isinstance(cell_value, str) and self._search_regex.search(cell_value):
-                    self._search_last_row = r
-                    self._search_last_col = c
-                    idx = self.model.index(r, c)
-                    self.table.setCurrentIndex(idx)
-                    self.table.scrollTo(idx)
-                    return
-
-        # Wrap around to beginning
-        for r in range(0, min(start_row + 1, len(rows))):
-            row = rows[r]
-            # if r == start_row, only search up to (but not including) start_col
-            col_end = start_col if r == start_row else len(row)
-            col_end = max(SEARCHABLE_COL_START, col_end)
-
-            for c in range(SEARCHABLE_COL_START, min(col_end, len(row))):
-                cell_value = row[c]
-                if isinstance(cell_value, str) and self._search_regex.search(cell_value):
-                    self._search_last_row = r
-                    self._search_last_col = c
-                    idx = self.model.index(r, c)
-                    self.table.setCurrentIndex(idx)
-                    self.table.scrollTo(idx)
-                    return
+        # First hit at or after the start position, wrapping around to the first one
+        i = bisect_left(matches, start)
+        self._select_search_match(*(matches[i] if i < len(matches) else matches[0]))
 
     def find_previous(self):
         if not self._search_regex or not self.model:
@@ -416,37 +536,17 @@ class TwoDADocument(QWidget):
             start_row = self._search_last_row
             start_col = self._search_last_col - 1
 
-        # Backward scan
-        for r in range(start_row, -1, -1):
-            row = rows[r]
-            col_start = start_col if r == start_row else len(row) - 1
-            col_start = min(col_start, len(row) - 1)
-
-            for c in range(col_start, SEARCHABLE_COL_START - 1, -1):
-                cell_value = row[c]
-                if isinstance(cell_value, str) and self._search_regex.search(cell_value):
-                    self._search_last_row = r
-                    self._search_last_col = c
-                    idx = self.model.index(r, c)
-                    self.table.setCurrentIndex(idx)
-                    self.table.scrollTo(idx)
-                    return
-
-        # Wrap around to end
-        for r in range(len(rows) - 1, start_row - 1, -1):
-            row = rows[r]
-            col_start = (len(row) - 1) if r != start_row else start_col
-            col_start = min(col_start, len(row) - 1)
+        matches = self._search_match_list()
+        if not matches:
+            return
 
-            for c in range(col_start, SEARCHABLE_COL_START - 1, -1):
-                cell_value = row[c]
-                if isinstance(cell_value, str) and self._search_regex.search(cell_value):
-                    self._search_last_row = r
-                    self._search_last_col = c
-                    idx = self.model.index(r, c)
-                    self.table.setCurrentIndex(idx)
-                    self.table.scrollTo(idx)
-                    return
+        # Last hit at or before the start position
+        i = bisect_right(matches, (start_row, start_col)) - 1
+        if i >= 0:
+            self._select_search_match(*matches[i])
+        # Wrap around to end (rows below the start row)
+        elif matches[-1][0] > start_row:
+            self._select_search_match(*matches[-1])
 
     # -----------------------------
     # Replace
@@ -460,10 +560,9 @@ class TwoDADocument(QWidget):
         if not self._search_regex:
             return
 
-        cell = self.model._rows[r][c]
-        if not isinstance(cell, str):
-            return
-
+        # The last match may point past a short row (or a deleted one); read it as
+        # the view shows it
+        cell = self.model.get_cells([(r, c)])[0]
         match = self._search_regex.search(cell)
         if not match:
             return
@@ -477,20 +576,27 @@ class TwoDADocument(QWidget):
             return
 
         rows = self.model._rows
-        modified = False
-
-        # Replace in searchable region only
+        subn = regex.subn
+        row_search = _row_prefilter(regex)
+        join = CELL_DELIMITER.join
+        updates = []
+
+        # Replace in searchable region only. subn() finds and substitutes in one
+        # scan of the cell; a count of 0 means there was no match. Cells are
+        # always str (the model coerces on write), so no type check is needed.
         for r, row in enumerate(rows):
+            if row_search and not row_search(join(row[SEARCHABLE_COL_START:])):
+                continue
             for c in range(SEARCHABLE_COL_START, len(row)):
                 cell_value = row[c]
-                if isinstance(cell_value, str) and regex.search(cell_value):
-                    new_value = regex.sub(replacement, cell_value)
-                    if new_value != cell_value:
-                        # emit_edit_signal=False to avoid generating per-cell undo commands
-                        self.model.set_cell(r, c, new_value, emit_edit_signal=False)
-                        modified = True
-
-        if modified:
+                new_value, count = subn(replacement, cell_value)
+                if count and new_value != cell_value:
+                    updates.append((r, c, new_value))
+
+        if updates:
+            # One dataChanged over the replaced cells; emit_edit_signal=False to
+            # avoid generating per-cell undo commands
+            self.model.set_cells(updates, emit_edit_signal=False)
             self._mark_dirty()
 
     # -----------------------------
@@ -498,13 +604,25 @@ class TwoDADocument(QWidget):
     # -----------------------------
     def _mark_dirty(self):
         self.is_dirty = True
-        mw = self.window()
-        if mw and hasattr(mw, "update_tab_title"):
-            mw.update_tab_title(self)
+        self._title_timer.start()
 
     def _on_clean_changed(self, clean):
         """Handle undo stack clean state changes."""
         self.is_dirty = not clean
-        mw = self.window()
-        if mw and hasattr(mw, "update_tab_title"):
-            mw.update_tab_title(self)
+        self._title_timer.start()
+
+    def _update_tab_title(self):
+        # window() walks the parent chain; only do that until the main window is found
+        cb = self._tab_title_cb
+        if cb is None:
+            mw = self.window()
+            cb = getattr(mw, "update_tab_title", None) if mw else None
+            if cb is None:
+                return
+            self._tab_title_cb = cb
+        cb(self)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.ParentChange:
+            self._tab_title_cb = None
+        super().changeEvent(event)
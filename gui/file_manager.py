@@ -33,7 +33,9 @@ class FileManager:
 
             header = [""] + data.header_fields
             rows = data.row_fields
-            doc.model.set_data(header, rows)
+            # row_fields is only read again on save, which replaces it with the
+            # model's rows, so the model can own these lists outright
+            doc.model.set_data(header, rows, copy_rows=False)
 
             doc.model.cellEdited.connect(
                 lambda r, c, o, n, d=doc:
@@ -155,7 +157,7 @@ class FileManager:
                 doc.current_data = data
                 header = [""] + data.header_fields
                 rows = data.row_fields
-                doc.model.set_data(header, rows)
+                doc.model.set_data(header, rows, copy_rows=False)
                 doc.is_dirty = False
                 doc.undo_stack.setClean()  # Mark undo stack as clean after reload
                 self.main_window.update_tab_title(doc)
@@ -1,5 +1,4 @@
 import os
-import re
 
 from PyQt5.QtWidgets import (
     QMainWindow,
@@ -284,20 +283,10 @@ class MainWindow(QMainWindow):
         if dlg.exec_() != dlg.Accepted:
             return
 
-        vals = dlg.values()
-        pat = vals["pattern"]
-        rep = vals["replacement"]
-        match_case = vals["match_case"]
-        whole = vals["whole_word"]
-
-        if not pat:
+        regex, rep = dlg.compiled()
+        if regex is None:
             return
 
-        flags = 0 if match_case else re.IGNORECASE
-        escaped = re.escape(pat)
-        pattern = r"\b" + escaped + r"\b" if whole else escaped
-        regex = re.compile(pattern, flags)
-
         doc.set_search_pattern(regex)
 
         if rep:
@@ -10,10 +10,12 @@ class TwoDATableModel(QAbstractTableModel):
         self._rows = []
         self._suspend_edit_signal = False
 
-    def set_data(self, header, rows):
+    def set_data(self, header, rows, *, copy_rows=True):
+        # copy_rows=False adopts the given row lists as-is (the caller hands them
+        # over), so a freshly loaded table is not duplicated in memory
         self.beginResetModel()
         self._header = list(header)
-        self._rows = [list(r) for r in rows]
+        self._rows = [list(r) for r in rows] if copy_rows else list(rows)
         self.endResetModel()
 
     def extract_data(self):
@@ -60,13 +62,15 @@ class TwoDATableModel(QAbstractTableModel):
 
         new_text = "" if value is None else str(value)
         row = self._rows[r]
-        while len(row) < len(self._header):
-            row.append("")
-
-        old_text = row[c]
+        old_text = row[c] if c < len(row) else ""
         if new_text == old_text:
             return True
 
+        # Pad short rows only when actually writing, so a no-op write never
+        # changes the row without a dataChanged
+        while len(row) < len(self._header):
+            row.append("")
+
         row[c] = new_text
         self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
 
@@ -115,13 +119,69 @@ class TwoDATableModel(QAbstractTableModel):
         finally:
             self._suspend_edit_signal = prev
 
+    def get_cells(self, cells):
+        """
+        Return the text of each (row, col) in cells as data() would display it,
+        read straight from the row lists ("" for cells outside the table).
+        Cells are always str: setData()/set_cells() coerce on write.
+        """
+        rows, n_cols = self._rows, len(self._header)
+        values = []
+
+        for r, c in cells:
+            value = ""
+            if 0 <= r < len(rows) and 0 <= c < n_cols:
+                row = rows[r]
+                if c < len(row):
+                    value = row[c]
+            values.append(value)
+
+        return values
+
+    def set_cells(self, updates, *, emit_edit_signal=True):
+        """
+        Write many (row, col, text) cells like set_cell(), but notify views with a
+        single dataChanged covering the changed cells instead of one per cell.
+        """
+        n_rows, n_cols = len(self._rows), len(self._header)
+        changed = []
+
+        for r, c, text in updates:
+            if not (0 <= r < n_rows) or not (0 <= c < n_cols):
+                continue
+
+            new_text = "" if text is None else str(text)
+            row = self._rows[r]
+            old_text = row[c] if c < len(row) else ""
+            if new_text == old_text:
+                continue
+
+            if len(row) < n_cols:
+                row.extend([""] * (n_cols - len(row)))
+            row[c] = new_text
+            changed.append((r, c, old_text, new_text))
+
+        if not changed:
+            return
+
+        rows = [r for r, _, _, _ in changed]
+        cols = [c for _, c, _, _ in changed]
+        self.dataChanged.emit(
+            self.index(min(rows), min(cols)),
+            self.index(max(rows), max(cols)),
+            [Qt.DisplayRole, Qt.EditRole],
+        )
+
+        if emit_edit_signal and not self._suspend_edit_signal:
+            for r, c, old_text, new_text in changed:
+                self.cellEdited.emit(r, c, old_text, new_text)
+
     def insertRows(self, row, count, parent=QModelIndex()):
         if count <= 0:
             return False
         row = max(0, min(row, len(self._rows)))
         self.beginInsertRows(QModelIndex(), row, row + count - 1)
-        for _ in range(count):
-            self._rows.insert(row, self.make_empty_row())   
+        self._rows[row:row] = [self.make_empty_row() for _ in range(count)]
         self.endInsertRows()
         return True
 
@@ -151,13 +211,13 @@ class TwoDATableModel(QAbstractTableModel):
         # --- normalize all rows BEFORE inserting ---
         target_len = len(self._header) - count
         for row in self._rows:
-            while len(row) < target_len:
-                row.append("****")
+            if len(row) < target_len:
+                row.extend(["****"] * (target_len - len(row)))
 
-        # --- insert placeholder data ---
+        # --- insert placeholder data (one slice assignment shifts each row once) ---
+        placeholders = ["****"] * count
         for row in self._rows:
-            for i in range(count):
-                row.insert(column + i, "****")
+            row[column:column] = placeholders
 
         self.endInsertColumns()
 
@@ -215,12 +275,16 @@ class TwoDATableModel(QAbstractTableModel):
         row = max(0, min(row, len(self._rows)))
         count = len(rows_data)
 
-        self.beginInsertRows(QModelIndex(), row, row + count - 1)
-        for i, data in enumerate(rows_data):
+        n_cols = len(self._header)
+        new_rows = []
+        for data in rows_data:
             r = list(data)
-            while len(r) < len(self._header):
-                r.append("")
-            self._rows.insert(row + i, r)
+            if len(r) < n_cols:
+                r.extend([""] * (n_cols - len(r)))
+            new_rows.append(r)
+
+        self.beginInsertRows(QModelIndex(), row, row + count - 1)
+        self._rows[row:row] = new_rows
         self.endInsertRows()
         return True
 
@@ -233,5 +297,6 @@ class TwoDATableModel(QAbstractTableModel):
         removed = self._rows[row:last]
         del self._rows[row:last]
         self.endRemoveRows()
-        return [list(r) for r in removed]
+        # The detached row lists are no longer referenced by the model; hand them over as-is
+        return removed
 
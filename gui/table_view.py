@@ -1,3 +1,5 @@
+from contextlib import nullcontext
+
 from PyQt5.QtWidgets import (
     QTableView,
     QMenu,
@@ -452,22 +454,32 @@ class TwoDATable(QTableView, FrozenViewMixin):
         if not rows_data:
             return
 
+        # Each pasted cell pushes its own edit command; group them so the whole
+        # paste is a single undo step
+        doc = self.parent()
+        batch = doc.batch_edit("Paste") if hasattr(doc, "batch_edit") else nullcontext()
+
         # Paste data starting from current position
-        for row_offset, row_data in enumerate(rows_data):
-            target_row = start_row + row_offset
-            if target_row >= self.model().rowCount():
-                # Add rows if needed
-                rows_to_add = target_row - self.model().rowCount() + 1
-                self.model().insertRows(self.model().rowCount(), rows_to_add)
-
-            for col_offset, cell_value in enumerate(row_data):
-                target_col = start_col + col_offset
-                if target_col < self.model().columnCount():
-                    index = self.model().index(target_row, target_col)
-                    self.model().setData(index, cell_value, Qt.EditRole)
-
-        # Mark document as dirty if we have a parent document
-        if hasattr(self.parent(), '_mark_dirty'):
+        changed = False
+        with batch:
+            for row_offset, row_data in enumerate(rows_data):
+                target_row = start_row + row_offset
+                if target_row >= self.model().rowCount():
+                    # Add rows if needed
+                    rows_to_add = target_row - self.model().rowCount() + 1
+                    self.model().insertRows(self.model().rowCount(), rows_to_add)
+                    changed = True
+
+                for col_offset, cell_value in enumerate(row_data):
+                    target_col = start_col + col_offset
+                    if target_col < self.model().columnCount():
+                        index = self.model().index(target_row, target_col)
+                        if self.model().data(index, Qt.EditRole) != cell_value:
+                            self.model().setData(index, cell_value, Qt.EditRole)
+                            changed = True
+
+        # Mark document as dirty if the paste changed anything and we have a parent document
+        if changed and hasattr(self.parent(), '_mark_dirty'):
             self.parent()._mark_dirty()
 
     def keyPressEvent(self, event):